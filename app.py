@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import base64
+import binascii
+import bisect
 import hashlib
+import hmac
 import os
-import uuid
+import re
+import secrets
+import shutil
+import time
+import types
 import json
 import io
 import csv
+import cProfile
+import pstats
+import functools
+from collections import OrderedDict
 import qrcode
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Mapping, Optional, Tuple
 
 from flask import (
     Flask,
@@ -18,15 +29,24 @@ from flask import (
     redirect,
     url_for,
     flash,
+    g,
     session,
     Response,
+    abort,
+    make_response,
     send_from_directory,
+    stream_with_context,
 )
 
+from sqlalchemy import DateTime, Integer, case, cast, func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+from markupsafe import Markup
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 from PIL import Image
 from flask_wtf import CSRFProtect
+from flask_wtf.csrf import generate_csrf
 from forms import ClueForm, SettingsForm, CONFIG_KEY_HINT_DELAY_SECONDS, CONFIG_KEY_POINTS_SOLVE, CONFIG_KEY_PENALTY_HINT, CONFIG_KEY_PENALTY_SKIP, CONFIG_KEY_TIME_PENALTY_WINDOW_SECONDS, CONFIG_KEY_TIME_PENALTY_POINTS
 from models import db, Team, Clue, Progress, Config, init_app_db, generate_readable_slug
 
@@ -38,11 +58,45 @@ app.config.from_object("config")
 app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 * 1024
 # Make Flask respect reverse proxy headers and prefer HTTPS for URL generation
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_port=1)
+
+
+def _healthz_short_circuit(wsgi_app):
+    """
+    Answer liveness probes (GET/HEAD /healthz) before Flask builds a request context,
+    so they skip routing, session loading, before/after_request hooks and the DB.
+    """
+    def middleware(environ, start_response):
+        if environ.get("PATH_INFO") == "/healthz" and environ.get("REQUEST_METHOD") in ("GET", "HEAD"):
+            start_response("200 OK", [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", "2")])
+            return [] if environ["REQUEST_METHOD"] == "HEAD" else [b"ok"]
+        return wsgi_app(environ, start_response)
+
+    return middleware
+
+
+app.wsgi_app = _healthz_short_circuit(app.wsgi_app)
 app.config.setdefault("PREFERRED_URL_SCHEME", "https")
+# GAME_SETTINGS never change at runtime: freeze once and share the same mapping with every render
+GAME_SETTINGS_FROZEN = types.MappingProxyType(dict(app.config.get("GAME_SETTINGS", {})))
+
+# Optional Redis-backed server-side sessions: the cookie then only carries a session id,
+# and session data is shared by all gunicorn workers/replicas.
+redis_client = None
+if app.config.get("REDIS_URL"):
+    import redis
+    from flask_session import Session
+
+    redis_client = redis.from_url(app.config["REDIS_URL"])
+    app.config.update(
+        SESSION_TYPE="redis",
+        SESSION_REDIS=redis_client,
+        SESSION_PERMANENT=False,  # keep browser-session lifetime, same as cookie sessions
+    )
+    Session(app)
 
-# Ensure data/ exists for SQLite volume mapping and uploads dir
-os.makedirs("data", exist_ok=True)
-os.makedirs(os.path.join("data", "uploads"), exist_ok=True)
+# Clue image uploads live under DATA_DIR (created by config.py) next to the database
+UPLOADS_DIR = os.path.join(app.config["DATA_DIR"], "uploads")
+os.makedirs(UPLOADS_DIR, exist_ok=True)
 csrf = CSRFProtect(app)
 
 # Initialize database and seed default clues
@@ -50,53 +104,240 @@ init_app_db(app)
 
 
 # Utilities and helpers
+@functools.lru_cache(maxsize=1024)
+def _variant_bits(team_token: str) -> int:
+    """256 per-clue variant bits for a team, derived from a single BLAKE2b-256 of its token."""
+    return int.from_bytes(hashlib.blake2b(team_token.encode("utf-8"), digest_size=32).digest(), "big")
+
+
 def choose_variant(team_token: str, clue_id: int) -> str:
     """
     Deterministic variant chooser using team token and clue id.
-    Returns "A" if even, else "B".
+    Returns "A" if bit (clue_id mod 256) of the team's variant bits is 0, else "B".
+    Only called when a Progress row is created; the variant is persisted there.
+    """
+    return "B" if (_variant_bits(team_token) >> (clue_id % 256)) & 1 else "A"
+
+
+def get_game_settings() -> Mapping[str, int]:
+    return GAME_SETTINGS_FROZEN
+
+
+# Process-local clue cache. Clues only change through the setup/admin routes, which
+# call _bump_clues_version(); every worker compares the stored version once per
+# request and reloads its copy when it differs.
+_CLUE_CACHE: dict = {
+    "loaded": False,
+    "version": None,
+    "ordered": [],      # list[Clue] sorted by (order_index, id)
+    "next_by_id": {},   # clue id -> next clue by order_index (None after the last)
+    "by_id": {},
+    "by_slug": {},
+}
+
+
+def get_config_map() -> dict[str, str]:
     """
-    key = f"{team_token}:{clue_id}".encode("utf-8")
-    h = hashlib.sha256(key).hexdigest()
-    return "A" if int(h, 16) % 2 == 0 else "B"
+    All Config rows as {key: value}, loaded with one query and memoized for the request.
+    Not shared across requests: other gunicorn workers may change Config at any time.
+    Handlers that write Config drop it with g.pop("config_map", None) after committing.
+    """
+    if "config_map" not in g:
+        g.config_map = dict(db.session.execute(select(Config.key, Config.value)).all())
+    return g.config_map
+
+
+def get_config_value(key: str) -> Optional[str]:
+    return get_config_map().get(key)
 
 
-def get_game_settings() -> dict:
-    return app.config.get("GAME_SETTINGS", {})
+def is_game_started() -> bool:
+    return bool((get_config_value("GAME_STARTED_AT") or "").strip())
+
+
+def _bump_clues_version() -> None:
+    """Invalidate cached clues in all workers. Call before committing a clue change."""
+    version = secrets.token_hex(16)
+    row = db.session.get(Config, "CLUES_VERSION")
+    if row:
+        row.value = version
+    else:
+        db.session.add(Config(key="CLUES_VERSION", value=version))
+    g.pop("config_map", None)
+
+
+def get_clues() -> dict:
+    """
+    Return the clue cache, reloading it when CLUES_VERSION has changed.
+    Cached Clue objects are transient copies (never attached to a session): read-only.
+    """
+    version = get_config_value("CLUES_VERSION")
+    if not _CLUE_CACHE["loaded"] or _CLUE_CACHE["version"] != version:
+        rows = db.session.execute(
+            select(Clue.__table__).order_by(Clue.order_index.asc(), Clue.id.asc())
+        ).mappings()
+        ordered = [Clue(**r) for r in rows]
+        # Next clue = first clue with a strictly greater order_index (ties share a successor)
+        order_keys = [c.order_index for c in ordered]
+        next_by_id = {}
+        for c in ordered:
+            idx = bisect.bisect_right(order_keys, c.order_index)
+            next_by_id[c.id] = ordered[idx] if idx < len(ordered) else None
+        _CLUE_CACHE.update(
+            loaded=True,
+            version=version,
+            ordered=ordered,
+            next_by_id=next_by_id,
+            by_id={c.id: c for c in ordered},
+            by_slug={c.slug: c for c in ordered if c.slug},
+        )
+        _render_clue_body.cache_clear()
+    return _CLUE_CACHE
+
+
+def _get_clue(clue_id: Optional[int] = None, slug: Optional[str] = None) -> Optional[Clue]:
+    clues = get_clues()
+    if clue_id is not None:
+        return clues["by_id"].get(clue_id)
+    if slug is not None:
+        return clues["by_slug"].get(slug)
+    return None
 
 
 def _get_first_clue() -> Optional[Clue]:
-    return Clue.query.order_by(Clue.order_index.asc()).first()
+    ordered = get_clues()["ordered"]
+    return ordered[0] if ordered else None
 
 
 def _get_final_clue() -> Optional[Clue]:
-    return Clue.query.filter_by(is_final=True).order_by(Clue.order_index.desc()).first()
+    for c in reversed(get_clues()["ordered"]):
+        if c.is_final:
+            return c
+    return None
 
 
 def _get_next_clue(current: Clue) -> Optional[Clue]:
-    return (
-        Clue.query.filter(Clue.order_index > current.order_index)
-        .order_by(Clue.order_index.asc())
-        .first()
+    return get_clues()["next_by_id"].get(current.id)
+
+
+def _total_clues() -> int:
+    return len(get_clues()["ordered"])
+
+
+# Stands in for the per-session CSRF token inside the cached clue card
+_CSRF_PLACEHOLDER = "__CSRF_TOKEN__"
+
+
+@functools.lru_cache(maxsize=64)
+def _render_clue_body(clue_id: int, variant: str, hint_revealed: bool) -> str:
+    """
+    Render the static clue card (_clue_body.html) once per (clue, variant, hint state).
+    Cleared whenever get_clues() reloads; callers must have called get_clues() this request.
+    """
+    clue_obj = _CLUE_CACHE["by_id"][clue_id]
+    body_text = clue_obj.body_variants[0 if variant == "A" else 1]
+    # Rendered straight from the Jinja env so context processors (team name etc.) stay out
+    return app.jinja_env.get_template("_clue_body.html").render(
+        clue=clue_obj,
+        clue_id=clue_obj.id,
+        body_text=body_text,
+        hint_text=clue_obj.hint_text,
+        answer_type=clue_obj.answer_type,
+        hint_revealed=hint_revealed,
+        mcq_options=clue_obj.mcq_options,
+        GAME_SETTINGS=get_game_settings(),
+        csrf_placeholder=_CSRF_PLACEHOLDER,
+    )
+
+
+def _pick_display_variant(clue_obj: Clue, assigned: str) -> str:
+    """Assigned variant, or the other one when the assigned body has no text."""
+    bodies = clue_obj.body_variants
+    idx = 0 if assigned == "A" else 1
+    if not bodies[idx] and bodies[1 - idx]:
+        idx = 1 - idx
+    return "AB"[idx]
+
+
+def _render_clue_page(clue_obj: Clue, variant: str, hint_revealed: bool) -> str:
+    clue_body = _render_clue_body(clue_obj.id, variant, bool(hint_revealed))
+    return render_template(
+        "clue.html",
+        clue_id=clue_obj.id,
+        variant=variant,
+        title=clue_obj.title,
+        clue_body=Markup(clue_body.replace(_CSRF_PLACEHOLDER, generate_csrf())),
+        display_index=clue_obj.order_index,
+        total_clues=_total_clues(),
     )
 
 
+# Redis cache of team identity (team:{id} -> "token|name"), only used when REDIS_URL is set
+TEAM_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _team_cache_epoch() -> str:
+    # admin_reset rotates CLIENT_NONCE; entries cached before a reset never match after it,
+    # even if another worker re-cached a pre-reset row while the reset was committing
+    return get_config_value("CLIENT_NONCE") or ""
+
+
+def _cache_team(team_id: int, token: str, name: str) -> None:
+    if redis_client is not None:
+        redis_client.setex(
+            f"team:{team_id}", TEAM_CACHE_TTL_SECONDS, f"{_team_cache_epoch()}|{token}|{name}"
+        )
+
+
+def _load_cached_team(team_id: int, token: str) -> Optional[Team]:
+    """
+    Build the session's Team from the Redis identity cache without a SELECT.
+    Columns other than id/token/name are left unloaded and load lazily on first access.
+    """
+    if redis_client is None:
+        return None
+    cached = redis_client.get(f"team:{team_id}")
+    if not cached:
+        return None
+    parts = cached.decode("utf-8").split("|", 2)
+    if len(parts) != 3:
+        return None
+    epoch, cached_token, name = parts
+    if epoch != _team_cache_epoch():
+        return None
+    if not hmac.compare_digest(cached_token.encode("utf-8"), token.encode("utf-8")):
+        return None
+    team = Team(id=team_id, token=cached_token, name=name)
+    make_transient_to_detached(team)
+    db.session.add(team)
+    return team
+
+
 def get_current_team_record() -> Optional[Team]:
+    # Memoized per request: views and inject_globals both ask for the team
+    if "team" in g:
+        return g.team
+    g.team = None
     team_id = session.get("team_id")
     token = session.get("team_token")
     if not team_id or not token:
         return None
-    team = Team.query.get(team_id)
+    cached = _load_cached_team(team_id, token)
+    if cached is not None:
+        g.team = cached
+        return g.team
+    team = db.session.get(Team, team_id)
     if team and team.token == token:
-        return team
-    return None
+        _cache_team(team.id, team.token, team.name)
+        g.team = team
+    return g.team
 
 
 def get_current_team_name() -> Optional[str]:
-    team = get_current_team_record()
-    if team:
-        return team.name
-    # fallback to any stored name (pre-Step2)
-    return session.get("team_name")
+    # Prefer a team the view already loaded (it may have just been renamed); otherwise
+    # the name stored in the session, without touching the database
+    team = g.get("team")
+    return team.name if team else session.get("team_name")
 
 
 def unauthorized_response() -> Response:
@@ -109,49 +350,211 @@ def unauthorized_response() -> Response:
 
 
 def extract_basic_auth_password(req) -> Optional[str]:
-    auth_header = req.headers.get("Authorization", "")
-    if not auth_header.startswith("Basic "):
+    """Password from an "Authorization: Basic base64(user:password)" header, else None."""
+    # WSGI header values are latin-1 decoded, so this round-trips the raw header bytes
+    header = req.headers.get("Authorization", "").encode("latin-1", "replace")
+    if not header.startswith(b"Basic "):
         return None
     try:
-        encoded = auth_header.split(" ", 1)[1]
-        decoded = base64.b64decode(encoded).decode("utf-8")
-        # Expect "username:password"
-        if ":" in decoded:
-            return decoded.split(":", 1)[1]
+        decoded = base64.b64decode(header[6:], validate=True)
+        sep = decoded.find(b":")
+        return decoded[sep + 1:].decode("utf-8") if sep >= 0 else None
+    except (binascii.Error, UnicodeDecodeError):
         return None
-    except Exception:
+
+
+# Failed admin logins allowed per client IP within the window before answering 429
+ADMIN_FAIL_LIMIT = 20
+ADMIN_FAIL_WINDOW_SECONDS = 60
+# In-process fallback when Redis is not configured: ip -> (window_start, failures),
+# kept in window-start order so expired entries can be swept from the front
+ADMIN_FAIL_MAX_TRACKED_IPS = 10000
+_admin_failures: OrderedDict[str, Tuple[float, int]] = OrderedDict()
+
+
+def _admin_failures_exceeded(ip: str) -> bool:
+    if redis_client is not None:
+        count = redis_client.get(f"admin:fail:{ip}")
+        return count is not None and int(count) >= ADMIN_FAIL_LIMIT
+    window_start, count = _admin_failures.get(ip, (0.0, 0))
+    if time.monotonic() - window_start >= ADMIN_FAIL_WINDOW_SECONDS:
+        return False
+    return count >= ADMIN_FAIL_LIMIT
+
+
+def _record_admin_failure(ip: str) -> None:
+    if redis_client is not None:
+        key = f"admin:fail:{ip}"
+        # Create the key with its TTL and increment in one MULTI/EXEC, so a counter
+        # can never be left without an expiry
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.set(key, 0, ex=ADMIN_FAIL_WINDOW_SECONDS, nx=True)
+        pipe.incr(key)
+        pipe.execute()
+        return
+    now = time.monotonic()
+    # Sweep expired windows (oldest first) and cap the table size
+    while _admin_failures:
+        oldest_ip, (oldest_start, _) = next(iter(_admin_failures.items()))
+        if now - oldest_start < ADMIN_FAIL_WINDOW_SECONDS and len(_admin_failures) < ADMIN_FAIL_MAX_TRACKED_IPS:
+            break
+        del _admin_failures[oldest_ip]
+    window_start, count = _admin_failures.get(ip, (now, 0))
+    if count == 0:
+        # New window: move to the end to keep the table ordered by window start
+        _admin_failures.pop(ip, None)
+    _admin_failures[ip] = (window_start, count + 1)
+
+
+# Read once at import; config.py takes it from the environment and it never changes at runtime
+ADMIN_PASSWORD_BYTES = app.config.get("ADMIN_PASSWORD", "").encode("utf-8")
+
+
+def _admin_password_ok(provided: Optional[str]) -> bool:
+    return bool(ADMIN_PASSWORD_BYTES) and hmac.compare_digest(
+        (provided or "").encode("utf-8"), ADMIN_PASSWORD_BYTES
+    )
+
+
+@app.before_request
+def set_request_time():
+    # One UTC timestamp per request: every write in a request is stamped with the same instant
+    g.now = datetime.utcnow()
+
+
+@app.before_request
+def require_admin_auth():
+    """Basic Auth guard for every /admin and /setup endpoint.
+
+    Runs before the view so unauthenticated requests never reach the database.
+    """
+    path = request.path
+    if not (path.startswith("/admin") or path.startswith("/setup")):
         return None
+    return _check_admin_credentials()
+
+
+def _check_admin_credentials() -> Optional[Response]:
+    """
+    Rate-limited Basic Auth check: None (and g.admin_authenticated set) when the admin
+    password was supplied, otherwise the 429/401 response to send.
+    """
+    ip = request.remote_addr or "-"
+    if _admin_failures_exceeded(ip):
+        return Response("Too many failed login attempts. Try again later.", 429)
+    provided = extract_basic_auth_password(request)
+    if _admin_password_ok(provided):
+        g.admin_authenticated = True
+        return None
+    # A bare request without credentials is the browser asking for the login prompt
+    if provided is not None:
+        _record_admin_failure(ip)
+    return unauthorized_response()
+
+
+@app.before_request
+def start_request_profiler():
+    """
+    Profile a single request with cProfile: add ?_profile=1 and admin Basic Auth to any URL.
+    Stats (top 40 by cumulative time) are appended to DATA_DIR/profile.log.
+    """
+    if request.args.get("_profile") != "1":
+        return None
+    if not g.get("admin_authenticated"):
+        # Public URL: same limiter as /admin, so the parameter is no password oracle.
+        # Wrong credentials only skip profiling; the page itself stays public.
+        denied = _check_admin_credentials()
+        if denied is not None:
+            return denied if denied.status_code == 429 else None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    g.profiler = profiler
+    return None
+
+
+@app.teardown_request
+def stop_request_profiler(_exc):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(40)
+    try:
+        with open(os.path.join(app.config["DATA_DIR"], "profile.log"), "a", encoding="utf-8") as fh:
+            fh.write(f"=== {g.now.isoformat()} {request.method} {request.full_path}\n")
+            fh.write(out.getvalue())
+    except OSError as e:
+        # A debug aid must not turn into a teardown error
+        app.logger.warning("Could not write profile.log: %s", e)
 
 
 @app.context_processor
 def inject_globals():
-    started_cfg = Config.query.get("GAME_STARTED_AT")
     return {
-        "GAME_SETTINGS": get_game_settings(),
+        "GAME_SETTINGS": GAME_SETTINGS_FROZEN,
         "current_team": get_current_team_name(),
-        "game_started": bool(started_cfg and (started_cfg.value or "").strip()),
+        "game_started": is_game_started(),
     }
 
 
 def _ensure_progress(team: Team, clue: Clue) -> Progress:
-    """Get or create a Progress row for the given team and clue."""
+    """
+    Get or create a Progress row for the given team and clue.
+    Does not commit: callers commit once after applying their own changes.
+    """
     prog = Progress.query.filter_by(team_id=team.id, clue_id=clue.id).first()
     if prog:
         return prog
-    variant = choose_variant(team.token, clue.id)
-    prog = Progress(
-        team_id=team.id,
-        clue_id=clue.id,
-        variant=variant,
-        started_at=datetime.utcnow(),
-        used_hint=False,
-        skipped=False,
+    # Insert-if-absent as a single statement backed by uq_progress_team_clue, so two
+    # concurrent first visits cannot race each other into an IntegrityError.
+    stmt = (
+        sqlite_insert(Progress)
+        .values(
+            team_id=team.id,
+            clue_id=clue.id,
+            variant=choose_variant(team.token, clue.id),
+            started_at=g.now,
+            used_hint=False,
+            skipped=False,
+            wrong_attempts=0,
+        )
+        .on_conflict_do_nothing(index_elements=["team_id", "clue_id"])
+        .returning(Progress)
     )
-    db.session.add(prog)
-    db.session.commit()
+    prog = db.session.scalars(stmt).first()
+    if prog is None:
+        # Lost the race: another request created the row first
+        prog = Progress.query.filter_by(team_id=team.id, clue_id=clue.id).one()
     return prog
 
 
+def _render_cached(template: str, etag_data, **context) -> Response:
+    """
+    Render `template` as a short-lived, revalidatable response.
+    The ETag covers `etag_data` (what the page shows) plus the per-viewer bits the layout
+    adds (team header, pending flashes, client nonce); when the browser already has that
+    version we answer 304 and skip rendering altogether.
+    """
+    fingerprint = repr((
+        template,
+        etag_data,
+        get_current_team_name(),
+        session.get("_flashes"),
+        get_config_value("CLIENT_NONCE"),
+    ))
+    etag = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=8).hexdigest()
+    if etag in request.if_none_match:
+        resp = Response(status=304)
+    else:
+        resp = make_response(render_template(template, **context))
+    resp.set_etag(etag)
+    # Private: the page header varies per team session
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 5
+    return resp
+
+
 def _format_duration(delta: timedelta) -> str:
     total = int(delta.total_seconds())
     h = total // 3600
@@ -162,25 +565,119 @@ def _format_duration(delta: timedelta) -> str:
     return f"{m:02d}:{s:02d}"
 
 
-def _compute_score(team: Team) -> Tuple[int, int, int, int, Optional[timedelta]]:
-    """Returns (score, solved_count, hint_count, skip_count, elapsed)."""
-    entries = Progress.query.filter_by(team_id=team.id).all()
-    solved_count = sum(1 for p in entries if p.solved_at is not None)
-    hint_count = sum(1 for p in entries if p.used_hint)
-    skip_count = sum(1 for p in entries if p.skipped)
-    wrong_attempts = sum((p.wrong_attempts or 0) for p in entries if getattr(p.clue, "answer_type", "").lower() == "mcq")
-    base = 10 * solved_count - 3 * hint_count - 8 * skip_count - 2 * wrong_attempts
+def _score_totals_select():
+    """Per-team GROUP BY over Progress: (team_id, base_score, solved, hints, skips)."""
+    solved = func.count(Progress.solved_at)
+    hints = func.sum(case((Progress.used_hint, 1), else_=0))
+    skips = func.sum(case((Progress.skipped, 1), else_=0))
+    mcq_wrong = func.sum(
+        case(
+            (func.lower(Clue.answer_type) == "mcq", func.coalesce(Progress.wrong_attempts, 0)),
+            else_=0,
+        )
+    )
+    base_score = 10 * solved - 3 * hints - 8 * skips - 2 * mcq_wrong
+    return (
+        select(
+            Progress.team_id,
+            base_score.label("base_score"),
+            solved.label("solved"),
+            hints.label("hints"),
+            skips.label("skips"),
+        )
+        .outerjoin(Clue, Clue.id == Progress.clue_id)
+        .group_by(Progress.team_id)
+    )
+
+
+def fetch_all_scores() -> dict[int, Tuple[int, int, int, int]]:
+    """
+    Aggregate Progress and compute the base score for all teams in a single GROUP BY query.
+    Returns {team_id: (base_score, solved_count, hint_count, skip_count)}; the
+    completion-time penalty is applied per team by `_compute_score()`.
+    """
+    rows = db.session.execute(_score_totals_select())
+    return {
+        team_id: (int(score or 0), int(solved or 0), int(hints or 0), int(skips or 0))
+        for team_id, score, solved, hints, skips in rows
+    }
+
+
+def _sql_elapsed_us(end, start):
+    """
+    Exact microseconds between two DATETIME columns/values as SQLAlchemy stores them on
+    SQLite ("YYYY-MM-DD HH:MM:SS.ffffff"): whole seconds via strftime('%s') plus the
+    microsecond digits, so results match Python timedelta arithmetic exactly.
+    The fraction is cut off before strftime: SQLite rounds it to milliseconds, so
+    "...:59.999600" would otherwise count as the next second.
+    """
+    return (
+        func.strftime("%s", func.substr(end, 1, 19)) - func.strftime("%s", func.substr(start, 1, 19))
+    ) * 1000000 + (
+        cast(func.substr(end, 21, 6), Integer) - cast(func.substr(start, 21, 6), Integer)
+    )
+
+
+def fetch_leaderboard_rows(game_started_at: Optional[datetime]) -> list:
+    """
+    Rank all teams in one query: Team LEFT JOIN per-team totals, with the completion-time
+    penalty (-1 per full 2 minutes) and the ranking done in SQL.
+    Rows are (name, score, solved, completed_at, elapsed_us) ordered by score desc, then
+    finished teams by elapsed time, then unfinished teams by join order.
+    """
+    totals = _score_totals_select().subquery()
+    baseline = literal(game_started_at, DateTime) if game_started_at else Team.created_at
+    elapsed_us = case((Team.completed_at.isnot(None), _sql_elapsed_us(Team.completed_at, baseline)))
+    window_us = 120 * 1000000
+    # Floor division (SQLite's integer "/" truncates toward zero)
+    penalty = case(
+        (elapsed_us >= 0, elapsed_us // window_us),
+        else_=(elapsed_us - (window_us - 1)) // window_us,
+    )
+    score = func.coalesce(totals.c.base_score, 0) - func.coalesce(penalty, 0)
+    stmt = (
+        select(
+            Team.name,
+            score.label("score"),
+            func.coalesce(totals.c.solved, 0),
+            Team.completed_at,
+            elapsed_us,
+        )
+        .outerjoin(totals, totals.c.team_id == Team.id)
+        .order_by(
+            score.desc(),
+            Team.completed_at.is_(None),
+            elapsed_us.asc(),
+            Team.created_at.asc(),
+            Team.id.asc(),
+        )
+    )
+    return db.session.execute(stmt).all()
+
+
+def _get_game_started_at() -> Optional[datetime]:
+    value = (get_config_value("GAME_STARTED_AT") or "").strip()
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except Exception:
+            return None
+    return None
+
+
+def _compute_score(
+    team: Team, scores: Optional[Tuple[int, int, int, int]], game_started_at: Optional[datetime]
+) -> Tuple[int, int, int, int, Optional[timedelta]]:
+    """
+    Returns (score, solved_count, hint_count, skip_count, elapsed).
+    `team` may be a Team or any row with `created_at`/`completed_at`.
+    `scores` is the team's entry from `fetch_all_scores()` (None if no progress yet).
+    """
+    base, solved_count, hint_count, skip_count = scores or (0, 0, 0, 0)
     elapsed: Optional[timedelta] = None
     if team.completed_at:
         # If a global game start exists, use it to compute elapsed; else fall back to team start
-        start_dt: Optional[datetime] = None
-        cfg = Config.query.get("GAME_STARTED_AT")
-        if cfg and (cfg.value or "").strip():
-            try:
-                start_dt = datetime.fromisoformat(cfg.value.strip())
-            except Exception:
-                start_dt = None
-        baseline = start_dt or team.created_at
+        baseline = game_started_at or team.created_at
         elapsed = team.completed_at - baseline
         # -1 per 2 full minutes elapsed
         penalty = int(elapsed.total_seconds() // 120)
@@ -191,9 +688,8 @@ def _compute_score(team: Team) -> Tuple[int, int, int, int, Optional[timedelta]]
 # Routes
 @app.get("/")
 def index():
-    total = Clue.query.count()
-    started_cfg = Config.query.get("GAME_STARTED_AT")
-    game_started = bool(started_cfg and (started_cfg.value or "").strip())
+    total = _total_clues()
+    game_started = is_game_started()
     return render_template("index.html", total_clues=total, game_started=game_started)
 
 
@@ -205,29 +701,30 @@ def start():
         return redirect(url_for("index"))
 
     # Reuse existing team in this browser session to avoid duplicates
-    team = None
-    sid = session.get("team_id")
-    stok = session.get("team_token")
-    if sid and stok:
-        existing = Team.query.get(sid)
-        if existing and existing.token == stok:
-            # Update name if changed
-            if existing.name != team_name:
-                existing.name = team_name
-                db.session.commit()
-                session["team_name"] = existing.name
-            team = existing
+    team = get_current_team_record()
+    if team and team.name != team_name:
+        # Update name if changed
+        team.name = team_name
+        db.session.commit()
+        _cache_team(team.id, team.token, team.name)
+        session["team_name"] = team.name
 
     # Create a new team only if we don't already have one in this session
     if team is None:
-        token = uuid.uuid4().hex
-        team = Team(name=team_name, token=token, created_at=datetime.utcnow())
-        db.session.add(team)
+        token = secrets.token_urlsafe(16)
+        # Core INSERT ... RETURNING: one statement, no ORM unit-of-work or post-insert refresh
+        team_id = db.session.execute(
+            insert(Team)
+            .values(name=team_name, token=token, created_at=g.now)
+            .returning(Team.id)
+        ).scalar_one()
         db.session.commit()
+        _cache_team(team_id, token, team_name)
         # Persist identity in session
-        session["team_id"] = team.id
-        session["team_token"] = team.token
-        session["team_name"] = team.name  # for header display
+        session["team_id"] = team_id
+        session["team_token"] = token
+        session["team_name"] = team_name  # for header display
+        g.pop("team", None)
 
     first = _get_first_clue()
     if not first:
@@ -235,8 +732,7 @@ def start():
         return redirect(url_for("index"))
 
     # If the game hasn't been started by an admin, keep team on the landing page
-    started_cfg = Config.query.get("GAME_STARTED_AT")
-    if not (started_cfg and (started_cfg.value or "").strip()):
+    if not is_game_started():
         flash("Waiting for the game to start. Please standby.", "info")
         # Auto-start will kick in via client-side polling once admin starts the game
         return redirect(url_for("index"))
@@ -249,35 +745,13 @@ def clue(id: int):
     # Preview support: /clue/<id>?variant=A|B renders without affecting DB/session
     preview_variant = (request.args.get("variant") or "").strip().upper()
     if preview_variant in ("A", "B"):
-        clue_obj = Clue.query.get(id)
+        clue_obj = _get_clue(id)
         if not clue_obj:
             return redirect(url_for("finish"))
-        body_text = clue_obj.body_variant_a if preview_variant == "A" else clue_obj.body_variant_b
-        mcq_options = None
-        try:
-            if (clue_obj.answer_type or "").lower() == "mcq":
-                import json as _json
-                _opts = _json.loads(clue_obj.answer_payload or "[]")
-                mcq_options = [str(o) for o in _opts if isinstance(o, str)]
-        except Exception:
-            mcq_options = []
-        return render_template(
-            "clue.html",
-            clue_id=clue_obj.id,
-            variant=preview_variant,
-            title=clue_obj.title,
-            body_text=body_text,
-            hint_text=clue_obj.hint_text,
-            answer_type=clue_obj.answer_type,
-            hint_revealed=False,
-            clue=clue_obj,
-            mcq_options=mcq_options,
-            display_index=clue_obj.order_index,
-            total_clues=Clue.query.count(),
-        )
+        return _render_clue_page(clue_obj, preview_variant, False)
 
     # If this is a tap-style clue with a slug, redirect to the NFC-friendly URL
-    clue_obj = Clue.query.get(id)
+    clue_obj = _get_clue(id)
     if clue_obj and clue_obj.answer_type == "tap" and clue_obj.slug:
         return redirect(url_for("clue_by_slug", slug=clue_obj.slug))
 
@@ -287,8 +761,7 @@ def clue(id: int):
         return redirect(url_for("index"))
 
     # Gate clues until admin starts the game
-    started_cfg = Config.query.get("GAME_STARTED_AT")
-    if not (started_cfg and (started_cfg.value or "").strip()):
+    if not is_game_started():
         flash("The game has not started yet. Please wait on the landing page.", "warning")
         return redirect(url_for("index"))
 
@@ -297,45 +770,9 @@ def clue(id: int):
         return redirect(url_for("finish"))
 
     prog = _ensure_progress(team, clue_obj)
+    db.session.commit()
 
-    # Body based on assigned variant
-    body_a = (clue_obj.body_variant_a or "").strip()
-    body_b = (clue_obj.body_variant_b or "").strip()
-    display_variant = prog.variant
-    if display_variant == "A":
-        body_text = body_a if body_a else (body_b if body_b else "")
-        if not body_a and body_b:
-            display_variant = "B"
-    else:
-        body_text = body_b if body_b else (body_a if body_a else "")
-        if not body_b and body_a:
-            display_variant = "A"
-
-    # If hint was already used, show it again via flash for visibility in current templates
-    # Hint banner removed; inline hint box only
-
-    mcq_options = None
-    try:
-        if (clue_obj.answer_type or "").lower() == "mcq":
-            import json as _json
-            _opts = _json.loads(clue_obj.answer_payload or "[]")
-            mcq_options = [str(o) for o in _opts if isinstance(o, str)]
-    except Exception:
-        mcq_options = []
-    return render_template(
-        "clue.html",
-        clue_id=clue_obj.id,
-        variant=display_variant,
-        title=clue_obj.title,
-        body_text=body_text,
-        hint_text=clue_obj.hint_text,
-        answer_type=clue_obj.answer_type,
-        hint_revealed=prog.used_hint,
-        clue=clue_obj,
-        mcq_options=mcq_options,
-        display_index=clue_obj.order_index,
-        total_clues=Clue.query.count(),
-    )
+    return _render_clue_page(clue_obj, _pick_display_variant(clue_obj, prog.variant), prog.used_hint)
 
 
 @app.get("/<slug>")
@@ -346,34 +783,12 @@ def clue_by_slug(slug: str):
     """
     # Preview support: /<slug>?variant=A|B
     preview_variant = (request.args.get("variant") or "").strip().upper()
-    clue_obj = Clue.query.filter_by(slug=slug).first()
+    clue_obj = _get_clue(slug=slug)
     if not clue_obj:
         return redirect(url_for("finish"))
 
     if preview_variant in ("A", "B"):
-        body_text = clue_obj.body_variant_a if preview_variant == "A" else clue_obj.body_variant_b
-        mcq_options = None
-        try:
-            if (clue_obj.answer_type or "").lower() == "mcq":
-                import json as _json
-                _opts = _json.loads(clue_obj.answer_payload or "[]")
-                mcq_options = [str(o) for o in _opts if isinstance(o, str)]
-        except Exception:
-            mcq_options = []
-        return render_template(
-            "clue.html",
-            clue_id=clue_obj.id,
-            variant=preview_variant,
-            title=clue_obj.title,
-            body_text=body_text,
-            hint_text=clue_obj.hint_text,
-            answer_type=clue_obj.answer_type,
-            hint_revealed=False,
-            clue=clue_obj,
-            mcq_options=mcq_options,
-            display_index=clue_obj.order_index,
-            total_clues=Clue.query.count(),
-        )
+        return _render_clue_page(clue_obj, preview_variant, False)
 
     team = get_current_team_record()
     if not team:
@@ -381,49 +796,15 @@ def clue_by_slug(slug: str):
         return redirect(url_for("index"))
 
     # Gate clues until admin starts the game
-    started_cfg = Config.query.get("GAME_STARTED_AT")
-    if not (started_cfg and (started_cfg.value or "").strip()):
+    if not is_game_started():
         flash("The game has not started yet. Please wait on the landing page.", "warning")
         return redirect(url_for("index"))
 
     # Ensure progress and render according to assigned variant
     prog = _ensure_progress(team, clue_obj)
-    body_a = (clue_obj.body_variant_a or "").strip()
-    body_b = (clue_obj.body_variant_b or "").strip()
-    display_variant = prog.variant
-    if display_variant == "A":
-        body_text = body_a if body_a else (body_b if body_b else "")
-        if not body_a and body_b:
-            display_variant = "B"
-    else:
-        body_text = body_b if body_b else (body_a if body_a else "")
-        if not body_b and body_a:
-            display_variant = "A"
-
-    # Hint banner removed; inline hint box only
+    db.session.commit()
 
-    mcq_options = None
-    try:
-        if (clue_obj.answer_type or "").lower() == "mcq":
-            import json as _json
-            _opts = _json.loads(clue_obj.answer_payload or "[]")
-            mcq_options = [str(o) for o in _opts if isinstance(o, str)]
-    except Exception:
-        mcq_options = []
-    return render_template(
-        "clue.html",
-        clue_id=clue_obj.id,
-        variant=display_variant,
-        title=clue_obj.title,
-        body_text=body_text,
-        hint_text=clue_obj.hint_text,
-        answer_type=clue_obj.answer_type,
-        hint_revealed=prog.used_hint,
-        clue=clue_obj,
-        mcq_options=mcq_options,
-        display_index=clue_obj.order_index,
-        total_clues=Clue.query.count(),
-    )
+    return _render_clue_page(clue_obj, _pick_display_variant(clue_obj, prog.variant), prog.used_hint)
 
 
 @app.post("/submit/<int:id>")
@@ -436,20 +817,23 @@ def submit(id: int = None, slug: str = None):
 
     clue_obj = None
     if id is not None:
-        clue_obj = Clue.query.get(id)
+        clue_obj = _get_clue(id)
     elif slug is not None:
-        clue_obj = Clue.query.filter_by(slug=slug).first()
+        clue_obj = _get_clue(slug=slug)
     if not clue_obj:
         return redirect(url_for("finish"))
 
     prog = _ensure_progress(team, clue_obj)
 
     if clue_obj.answer_type == "text":
-        submitted = (request.form.get("answer") or "").strip().lower()
-        # Allow multiple acceptable answers (comma-separated in answer_payload)
-        raw = (clue_obj.answer_payload or "")
-        options = [s.strip().lower() for s in raw.split(",") if s.strip()] if raw else []
-        if submitted not in set(options):
+        submitted = (request.form.get("answer") or "").strip().casefold().encode("utf-8")
+        # Allow multiple acceptable answers (comma-separated in answer_payload, normalized
+        # once per cached clue). Check all of them so timing does not reveal which matched.
+        matched = False
+        for expected in clue_obj.text_answers:
+            matched |= hmac.compare_digest(submitted, expected)
+        if not matched:
+            db.session.commit()  # keep a newly created progress row
             flash("Try again.", "danger")
             return redirect(url_for("clue", id=clue_obj.id))
     elif clue_obj.answer_type == "mcq":
@@ -460,30 +844,22 @@ def submit(id: int = None, slug: str = None):
             # Count wrong attempts only when an option is chosen and is incorrect
             if submitted:
                 prog.wrong_attempts = (prog.wrong_attempts or 0) + 1
-                db.session.commit()
+            db.session.commit()
             flash("Try again.", "danger")
             return redirect(url_for("clue", id=clue_obj.id))
 
     # For tap, correct text, or MCQ with no/valid answer, mark solved
     if not prog.solved_at:
-        prog.solved_at = datetime.utcnow()
+        prog.solved_at = g.now
+
+    # Final clue, or no next clue by order -> finish
+    next_clue = None if clue_obj.is_final else _get_next_clue(clue_obj)
+    if next_clue is None and not team.completed_at:
+        team.completed_at = g.now
     db.session.commit()
 
-    if clue_obj.is_final:
-        if not team.completed_at:
-            team.completed_at = datetime.utcnow()
-            db.session.commit()
+    if next_clue is None:
         return redirect(url_for("finish"))
-
-    # Next clue by order
-    next_clue = _get_next_clue(clue_obj)
-    if not next_clue:
-        # No next -> finish
-        if not team.completed_at:
-            team.completed_at = datetime.utcnow()
-            db.session.commit()
-        return redirect(url_for("finish"))
-
     return redirect(url_for("clue", id=next_clue.id))
 
 
@@ -497,20 +873,17 @@ def hint(id: int = None, slug: str = None):
 
     clue_obj = None
     if id is not None:
-        clue_obj = Clue.query.get(id)
+        clue_obj = _get_clue(id)
     elif slug is not None:
-        clue_obj = Clue.query.filter_by(slug=slug).first()
+        clue_obj = _get_clue(slug=slug)
     if not clue_obj:
         return redirect(url_for("finish"))
 
     prog = _ensure_progress(team, clue_obj)
+    # No flash: the clue page renders the revealed hint inline from Progress.used_hint
     if not prog.used_hint:
         prog.used_hint = True
-        db.session.commit()
-
-    # Surface the hint via flash so current template shows it
-    # No hint banner; rely on inline hint box
-    # No banner for "hint used"
+    db.session.commit()
     return redirect(url_for("clue", id=clue_obj.id))
 
 
@@ -524,94 +897,74 @@ def skip(id: int = None, slug: str = None):
 
     clue_obj = None
     if id is not None:
-        clue_obj = Clue.query.get(id)
+        clue_obj = _get_clue(id)
     elif slug is not None:
-        clue_obj = Clue.query.filter_by(slug=slug).first()
+        clue_obj = _get_clue(slug=slug)
     if not clue_obj:
         return redirect(url_for("finish"))
 
     prog = _ensure_progress(team, clue_obj)
     prog.skipped = True
     if not prog.solved_at:
-        prog.solved_at = datetime.utcnow()
-    db.session.commit()
+        prog.solved_at = g.now
 
-    if clue_obj.is_final:
-        if not team.completed_at:
-            team.completed_at = datetime.utcnow()
-            db.session.commit()
-        return redirect(url_for("finish"))
+    next_clue = None if clue_obj.is_final else _get_next_clue(clue_obj)
+    if next_clue is None and not team.completed_at:
+        team.completed_at = g.now
+    db.session.commit()
 
-    next_clue = _get_next_clue(clue_obj)
-    if not next_clue:
-        if not team.completed_at:
-            team.completed_at = datetime.utcnow()
-            db.session.commit()
+    if next_clue is None:
         return redirect(url_for("finish"))
-
     return redirect(url_for("clue", id=next_clue.id))
 
 
 @app.get("/leaderboard")
 def leaderboard():
-    teams = Team.query.order_by(Team.created_at.asc()).all()
-    total_clues = Clue.query.count()
+    total_clues = _total_clues()
     rows = []
-    for team in teams:
-        score, solved_count, hint_count, skip_count, elapsed = _compute_score(team)
-        if team.completed_at and elapsed is not None:
-            time_display = _format_duration(elapsed)
+    for rank, (name, score, solved_count, completed_at, elapsed_us) in enumerate(
+        fetch_leaderboard_rows(_get_game_started_at()), start=1
+    ):
+        if completed_at and elapsed_us is not None:
+            elapsed_seconds = elapsed_us / 1000000
+            time_display = _format_duration(timedelta(microseconds=elapsed_us))
         else:
             # Show current progress for unfinished teams
+            elapsed_seconds = None
             time_display = f"Clue {min(solved_count + 1, total_clues)} of {total_clues}"
         rows.append(
             {
-                "team": team.name,
+                "rank": rank,
+                "team": name,
                 "score": score,
                 "time": time_display,
-                "completed_at": team.completed_at,
-                "elapsed": elapsed.total_seconds() if elapsed is not None else None,
+                "completed_at": completed_at,
+                "elapsed": elapsed_seconds,
             }
         )
 
-    # Sort by score desc, then by fastest completion time for finished teams; unfinished go after
-    def sort_key(row):
-        completed = row["completed_at"] is not None
-        elapsed_key = row.get("elapsed", None)
-        if not (completed and elapsed_key is not None):
-            elapsed_key = float("inf")
-        return (-row["score"], 0 if completed else 1, elapsed_key)
-
-    rows.sort(key=sort_key)
-
-    # Assign ranks
-    for idx, row in enumerate(rows, start=1):
-        row["rank"] = idx
-
     note = None
-    return render_template("leaderboard.html", rows=rows, note=note)
+    return _render_cached("leaderboard.html", (rows, note), rows=rows, note=note)
 
 
 @app.get("/finish")
 def finish():
-    return render_template("finish.html")
+    return _render_cached("finish.html", None)
 
 
 @app.get("/admin")
 def admin():
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-
-    if not admin_password_expected:
-        return unauthorized_response()
-    if provided_password != admin_password_expected:
-        return unauthorized_response()
-
     # Live progress summary (passed to template; current template shows basic info)
     team_rows = []
-    total_clues = Clue.query.count()
-    for t in Team.query.order_by(Team.created_at.asc()).all():
-        _, solved_count, hint_count, skip_count, elapsed = _compute_score(t)
+    total_clues = _total_clues()
+    scores = fetch_all_scores()
+    game_started_at = _get_game_started_at()
+    # Plain rows: this page only reads a few columns, so skip ORM object hydration
+    teams = db.session.execute(
+        select(Team.id, Team.name, Team.created_at, Team.completed_at).order_by(Team.created_at.asc())
+    ).all()
+    for t in teams:
+        _, solved_count, hint_count, skip_count, elapsed = _compute_score(t, scores.get(t.id), game_started_at)
         current_clue_num = min(solved_count + 1, total_clues)
         team_rows.append(
             {
@@ -624,62 +977,68 @@ def admin():
             }
         )
 
-    started_cfg = Config.query.get("GAME_STARTED_AT")
     info = {
-        "admin_password_set": bool(admin_password_expected),
-        "active_teams": Team.query.count(),
-        "game_started": bool(started_cfg and (started_cfg.value or "").strip()),
+        "admin_password_set": bool(ADMIN_PASSWORD_BYTES),
+        "active_teams": len(teams),
+        "game_started": is_game_started(),
         "teams": team_rows,
-        "clues": Clue.query.order_by(Clue.order_index.asc(), Clue.id.asc()).all(),
+        "clues": get_clues()["ordered"],
     }
     return render_template("admin.html", **info)
 
 
 @app.post("/admin/reset")
 def admin_reset():
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     # Clear Teams and Progress, keep Clues
     Progress.query.delete()
     Team.query.delete()
+    # Variant bits are keyed by team token; none of these teams will be seen again
+    _variant_bits.cache_clear()
     # Clear global game start flag so status shows Not started
-    row = Config.query.get("GAME_STARTED_AT")
+    row = db.session.get(Config, "GAME_STARTED_AT")
     if row:
         db.session.delete(row)
-    db.session.commit()
     # Bump client nonce so browsers reset elapsed timer next page load
-    nonce = uuid.uuid4().hex
-    existing = Config.query.get("CLIENT_NONCE")
+    nonce = secrets.token_hex(16)
+    existing = db.session.get(Config, "CLIENT_NONCE")
     if existing:
         existing.value = nonce
     else:
         db.session.add(Config(key="CLIENT_NONCE", value=nonce))
     db.session.commit()
+    g.pop("config_map", None)
+    # Team ids restart after the delete, so drop every cached identity. Only after the
+    # commit: until then other workers still see the old rows and may re-cache them
+    # (such entries carry the old CLIENT_NONCE and are rejected on read anyway).
+    if redis_client is not None:
+        stale = list(redis_client.scan_iter("team:*"))
+        if stale:
+            redis_client.delete(*stale)
     flash("Game reset. All teams and progress cleared.", "warning")
     return redirect(url_for("admin"))
 
 
 @app.post("/admin/rotate_slugs")
 def admin_rotate_slugs():
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
+    rows = db.session.execute(
+        select(Clue.id, Clue.slug).order_by(Clue.order_index.asc(), Clue.id.asc())
+    ).all()
     # Collect existing slugs to ensure uniqueness
-    existing = {c.slug for c in Clue.query.filter(Clue.slug.isnot(None)).all()}
+    existing = {slug for (_id, slug) in rows if slug}
 
     # Rotate slugs for all clues
-    for c in Clue.query.order_by(Clue.order_index.asc(), Clue.id.asc()).all():
-        if c.slug:
-            existing.discard(c.slug)  # allow reusing pattern space
+    updates = []
+    for clue_id, slug in rows:
+        if slug:
+            existing.discard(slug)  # allow reusing pattern space
         new_slug = generate_readable_slug(existing)
-        c.slug = new_slug
         existing.add(new_slug)
+        updates.append({"id": clue_id, "slug": new_slug})
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany, no Clue objects loaded
+        db.session.execute(update(Clue), updates)
 
+    _bump_clues_version()
     db.session.commit()
     flash("Clue URLs rotated successfully.", "success")
     return redirect(url_for("admin"))
@@ -687,32 +1046,23 @@ def admin_rotate_slugs():
 
 @app.post("/admin/start_game")
 def admin_start_game():
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     # Set a global game start timestamp (ISO 8601) so all teams start together
-    now_iso = datetime.utcnow().isoformat()
-    row = Config.query.get("GAME_STARTED_AT")
+    now_iso = g.now.isoformat()
+    row = db.session.get(Config, "GAME_STARTED_AT")
     if row:
         row.value = now_iso
     else:
         db.session.add(Config(key="GAME_STARTED_AT", value=now_iso))
     db.session.commit()
+    g.pop("config_map", None)
     flash("Game started for all teams.", "success")
     return redirect(url_for("admin"))
 
 
 @app.get("/admin/export_csv")
 def admin_export_csv():
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     # Build CSV header
-    clues = Clue.query.order_by(Clue.order_index.asc(), Clue.id.asc()).all()
+    clues = get_clues()["ordered"]
     base_headers = [
         "team_name",
         "team_token",
@@ -733,83 +1083,98 @@ def admin_export_csv():
             f"clue_{c.id}_solved_at",
         ])
 
-    sio = io.StringIO()
-    writer = csv.writer(sio)
-    writer.writerow(base_headers + per_clue_headers)
-
-    teams = Team.query.order_by(Team.created_at.asc()).all()
-    for team in teams:
-        score, solved_count, hint_count, skip_count, _elapsed = _compute_score(team)
-        row = [
-            team.name,
-            team.token,
-            team.created_at.isoformat() if team.created_at else "",
-            team.completed_at.isoformat() if team.completed_at else "",
-            solved_count,
-            hint_count,
-            skip_count,
-            score,
-        ]
-        # Map progress by clue_id for quick lookup
-        progresses = {
-            p.clue_id: p for p in Progress.query.filter_by(team_id=team.id).all()
-        }
-        for c in clues:
-            p = progresses.get(c.id)
-            row.extend([
-                (p.variant if p else ""),
-                ("1" if (p and p.used_hint) else "0"),
-                ("1" if (p and p.skipped) else "0"),
-                (p.started_at.isoformat() if (p and p.started_at) else ""),
-                (p.solved_at.isoformat() if (p and p.solved_at) else ""),
-            ])
-        writer.writerow(row)
-
-    output = sio.getvalue()
+    def generate():
+        # One small reusable buffer: each row is written, yielded, and the buffer reset
+        sio = io.StringIO()
+        writer = csv.writer(sio)
+
+        def flush_row(values) -> str:
+            writer.writerow(values)
+            out = sio.getvalue()
+            sio.seek(0)
+            sio.truncate(0)
+            return out
+
+        yield flush_row(base_headers + per_clue_headers)
+
+        scores = fetch_all_scores()
+        game_started_at = _get_game_started_at()
+        # Teams are fetched in batches, each with its progress rows (one IN query per batch)
+        teams = (
+            Team.query.options(selectinload(Team.progress_entries))
+            .order_by(Team.created_at.asc())
+            .yield_per(100)
+        )
+        for team in teams:
+            score, solved_count, hint_count, skip_count, _elapsed = _compute_score(team, scores.get(team.id), game_started_at)
+            row = [
+                team.name,
+                team.token,
+                team.created_at.isoformat() if team.created_at else "",
+                team.completed_at.isoformat() if team.completed_at else "",
+                solved_count,
+                hint_count,
+                skip_count,
+                score,
+            ]
+            # Map progress by clue_id for quick lookup
+            progresses = {p.clue_id: p for p in team.progress_entries}
+            for c in clues:
+                p = progresses.get(c.id)
+                row.extend([
+                    (p.variant if p else ""),
+                    ("1" if (p and p.used_hint) else "0"),
+                    ("1" if (p and p.skipped) else "0"),
+                    (p.started_at.isoformat() if (p and p.started_at) else ""),
+                    (p.solved_at.isoformat() if (p and p.solved_at) else ""),
+                ])
+            yield flush_row(row)
+
     headers = {
         "Content-Type": "text/csv; charset=utf-8",
         "Content-Disposition": 'attachment; filename="results.csv"',
         "Cache-Control": "no-store",
     }
-    return Response(output, headers=headers)
+    return Response(stream_with_context(generate()), headers=headers)
 
 
 @app.get("/admin/qr/<int:clue_id>.png")
 def admin_qr(clue_id: int):
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
-    clue = Clue.query.get_or_404(clue_id)
+    clue = _get_clue(clue_id)
+    if clue is None:
+        abort(404)
     url = url_for("clue", id=clue.id, _external=True)
-    img = qrcode.make(url)
-    bio = io.BytesIO()
-    img.save(bio, format="PNG")
-    bio.seek(0)
-    headers = {
-        "Content-Type": "image/png",
-        "Content-Disposition": f'attachment; filename="clue_{clue.id}.png"',
-        "Cache-Control": "no-store",
-    }
-    return Response(bio.read(), headers=headers)
+    # The PNG depends only on the URL, so render it once and serve the file afterwards
+    cache_dir = os.path.join(app.config["DATA_DIR"], "qr_cache")
+    filename = f"clue_{clue.id}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.png"
+    path = os.path.join(cache_dir, filename)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        qrcode.make(url).save(tmp_path, format="PNG")
+        os.replace(tmp_path, path)  # atomic: concurrent requests never serve a partial file
+    resp = send_from_directory(
+        cache_dir,
+        filename,
+        mimetype="image/png",
+        as_attachment=True,
+        download_name=f"clue_{clue.id}.png",
+    )
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
 
 
 @app.route("/setup", methods=["GET", "POST"])
 def setup():
-    # Admin protection (Basic Auth)
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     # Prepare settings form with defaults from Config table or fallbacks
+    cfg_map = get_config_map()
+
     def _get_cfg_int(key: str, default: int) -> int:
-        cfg = Config.query.get(key)
-        if not cfg:
+        value = cfg_map.get(key)
+        if value is None:
             return default
         try:
-            return int(cfg.value)
+            return int(value)
         except Exception:
             return default
 
@@ -833,13 +1198,16 @@ def setup():
             CONFIG_KEY_TIME_PENALTY_WINDOW_SECONDS: str(settings_form.time_penalty_window_seconds.data),
             CONFIG_KEY_TIME_PENALTY_POINTS: str(settings_form.time_penalty_points.data),
         }
+        # Load the existing setting rows in one query, then update or add each
+        rows = {row.key: row for row in Config.query.filter(Config.key.in_(list(kv)))}
         for k, v in kv.items():
-            row = Config.query.get(k)
+            row = rows.get(k)
             if row:
                 row.value = v
             else:
                 db.session.add(Config(key=k, value=v))
         db.session.commit()
+        g.pop("config_map", None)
         flash("Settings saved.", "success")
         return redirect(url_for("setup"))
 
@@ -848,14 +1216,72 @@ def setup():
     return render_template("setup.html", clues=clues, settings_form=settings_form)
 
 
+IMAGE_MAX_SIZE = (1600, 1600)
+ALLOWED_IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "webp", "gif"})
+ALLOWED_IMAGE_MIMETYPES = frozenset({"image/png", "image/jpeg", "image/webp", "image/gif"})
+_IMAGE_EXT_RE = re.compile(r"\.([A-Za-z0-9]{1,8})$")
+
+
+def _upload_image_name(clue_id: int, file) -> Optional[str]:
+    """Unique stored file name for an allowed image upload; None if its type is not allowed."""
+    m = _IMAGE_EXT_RE.search(file.filename or "")
+    ext = m.group(1).lower() if m else ""
+    if ext not in ALLOWED_IMAGE_EXTENSIONS or file.mimetype not in ALLOWED_IMAGE_MIMETYPES:
+        return None
+    filename = secure_filename(file.filename)
+    if not filename.lower().endswith("." + ext):
+        # secure_filename drops non-ASCII names entirely; keep the extension for serving
+        filename = f"{filename or 'image'}.{ext}"
+    return f"{clue_id}-{secrets.token_hex(16)}_{filename}"
+
+
+def _save_clue_image(stream, dest_path: str) -> None:
+    """
+    Downscale an uploaded image stream to IMAGE_MAX_SIZE and write it to dest_path.
+    Uploads already within bounds and without EXIF metadata are stored as-is, as are
+    files Pillow cannot process. The file is written under a temporary name and
+    renamed into place, so dest_path never holds a partial image.
+    """
+    tmp_path = f"{dest_path}.{secrets.token_hex(4)}.tmp"
+    try:
+        resized = False
+        try:
+            img = Image.open(stream)  # reads the header only
+            # Images already within bounds are stored as uploaded, skipping decode/re-encode.
+            # GIFs still go through Pillow (which keeps their first frame as before), and so
+            # does anything carrying EXIF: re-saving drops GPS/camera metadata before the
+            # file is served publicly.
+            oversized = img.width > IMAGE_MAX_SIZE[0] or img.height > IMAGE_MAX_SIZE[1]
+            if img.format == "GIF" or oversized or img.getexif():
+                if img.format == "JPEG":
+                    # Let libjpeg decode at a reduced scale instead of full resolution
+                    img.draft(img.mode, IMAGE_MAX_SIZE)
+                fmt = img.format
+                img.thumbnail(IMAGE_MAX_SIZE, Image.Resampling.LANCZOS)
+                save_kwargs = {}
+                if fmt == "JPEG":
+                    save_kwargs = {"optimize": True, "progressive": True}
+                elif fmt == "PNG":
+                    save_kwargs = {"optimize": True}
+                img.save(tmp_path, format=fmt, **save_kwargs)
+                resized = True
+        except Exception:
+            pass  # Fallback: store the upload as-is if Pillow fails
+        if not resized:
+            stream.seek(0)
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(stream, f)
+        os.replace(tmp_path, dest_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 @app.route("/setup/add", methods=["GET", "POST"])
 def setup_add():
-    # Admin protection
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     form = ClueForm()
     if form.validate_on_submit():
         clue = Clue(
@@ -870,41 +1296,25 @@ def setup_add():
             is_final=bool(form.is_final.data),
         )
         db.session.add(clue)
+        _bump_clues_version()
         db.session.commit()
 
         # Handle optional image upload
         file = form.image.data
         if file and getattr(file, "filename", ""):
-            allowed_ext = {"png", "jpg", "jpeg", "webp", "gif"}
-            filename = secure_filename(file.filename)
-            ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-            if ext in allowed_ext and (file.mimetype or "").startswith("image/"):
-                uploads_dir = os.path.join("data", "uploads")
-                unique_name = f"{clue.id}-{uuid.uuid4().hex}_{filename}"
-                dest_path = os.path.join(uploads_dir, unique_name)
+            unique_name = _upload_image_name(clue.id, file)
+            if unique_name:
+                dest_path = os.path.join(UPLOADS_DIR, unique_name)
                 try:
-                    data = file.read()
-                    from io import BytesIO
-                    bio = BytesIO(data)
-                    img = Image.open(bio)
-                    img.thumbnail((1600, 1600))
-                    img.save(dest_path)
+                    _save_clue_image(file.stream, dest_path)
                     clue.image_filename = unique_name
                     clue.image_alt = (form.image_alt.data or "").strip() or None
                     clue.image_caption = (form.image_caption.data or "").strip() or None
+                    _bump_clues_version()
                     db.session.commit()
                 except Exception:
-                    # Fallback: try saving raw if Pillow fails
-                    try:
-                        with open(dest_path, "wb") as f:
-                            f.write(data)
-                        clue.image_filename = unique_name
-                        clue.image_alt = (form.image_alt.data or "").strip() or None
-                        clue.image_caption = (form.image_caption.data or "").strip() or None
-                        db.session.commit()
-                    except Exception:
-                        db.session.rollback()
-                        flash("Failed to save image.", "warning")
+                    db.session.rollback()
+                    flash("Failed to save image.", "warning")
             else:
                 flash("Invalid image type. Allowed: png, jpg, jpeg, webp, gif.", "warning")
 
@@ -916,13 +1326,7 @@ def setup_add():
 
 @app.route("/setup/edit/<int:id>", methods=["GET", "POST"])
 def setup_edit(id: int):
-    # Admin protection
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
-    clue = Clue.query.get_or_404(id)
+    clue = db.get_or_404(Clue, id)
     form = ClueForm(obj=clue)
     # Prefill correct answer for MCQ in edit view
     if request.method == "GET" and (clue.answer_type or "").lower() == "mcq":
@@ -938,14 +1342,11 @@ def setup_edit(id: int):
         clue.order_index = form.order_index.data
         clue.is_final = bool(form.is_final.data)
 
-        # Handle image removal
-        uploads_dir = os.path.join("data", "uploads")
+        # Handle image removal; replaced files are deleted only after the commit
+        stale_images = []
         if getattr(form, "remove_image", None) and form.remove_image.data:
             if clue.image_filename:
-                try:
-                    os.remove(os.path.join(uploads_dir, clue.image_filename))
-                except Exception:
-                    pass
+                stale_images.append(clue.image_filename)
             clue.image_filename = None
             clue.image_alt = None
             clue.image_caption = None
@@ -953,33 +1354,16 @@ def setup_edit(id: int):
         # Handle image upload/replace
         file = form.image.data
         if file and getattr(file, "filename", ""):
-            allowed_ext = {"png", "jpg", "jpeg", "webp", "gif"}
-            filename = secure_filename(file.filename)
-            ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-            if ext in allowed_ext and (file.mimetype or "").startswith("image/"):
-                # Remove old file if present
-                if clue.image_filename:
-                    try:
-                        os.remove(os.path.join(uploads_dir, clue.image_filename))
-                    except Exception:
-                        pass
-                unique_name = f"{clue.id}-{uuid.uuid4().hex}_{filename}"
-                dest_path = os.path.join(uploads_dir, unique_name)
+            unique_name = _upload_image_name(clue.id, file)
+            if unique_name:
+                dest_path = os.path.join(UPLOADS_DIR, unique_name)
                 try:
-                    data = file.read()
-                    from io import BytesIO
-                    bio = BytesIO(data)
-                    img = Image.open(bio)
-                    img.thumbnail((1600, 1600))
-                    img.save(dest_path)
+                    _save_clue_image(file.stream, dest_path)
+                    if clue.image_filename:
+                        stale_images.append(clue.image_filename)
                     clue.image_filename = unique_name
                 except Exception:
-                    try:
-                        with open(dest_path, "wb") as f:
-                            f.write(data)
-                        clue.image_filename = unique_name
-                    except Exception:
-                        flash("Failed to save image.", "warning")
+                    flash("Failed to save image.", "warning")
             else:
                 flash("Invalid image type. Allowed: png, jpg, jpeg, webp, gif.", "warning")
 
@@ -987,7 +1371,13 @@ def setup_edit(id: int):
         clue.image_alt = (form.image_alt.data or "").strip() or clue.image_alt
         clue.image_caption = (form.image_caption.data or "").strip() or clue.image_caption
 
+        _bump_clues_version()
         db.session.commit()
+        for name in stale_images:
+            try:
+                os.remove(os.path.join(UPLOADS_DIR, name))
+            except Exception:
+                pass
         flash("Clue updated.", "success")
         return redirect(url_for("setup"))
 
@@ -996,14 +1386,9 @@ def setup_edit(id: int):
 
 @app.post("/setup/delete/<int:id>")
 def setup_delete(id: int):
-    # Admin protection
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
-    clue = Clue.query.get_or_404(id)
+    clue = db.get_or_404(Clue, id)
     db.session.delete(clue)
+    _bump_clues_version()
     db.session.commit()
     flash("Clue deleted.", "warning")
     return redirect(url_for("setup"))
@@ -1011,39 +1396,40 @@ def setup_delete(id: int):
 
 @app.get("/setup/export")
 def setup_export():
-    # Admin protection
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
-    clues = [
-        {
-            "id": c.id,
-            "title": c.title,
-            "body_variant_a": c.body_variant_a,
-            "body_variant_b": c.body_variant_b,
-            "answer_type": c.answer_type,
-            "answer_payload": c.answer_payload,
-            "hint_text": c.hint_text,
-            "order_index": c.order_index,
-            "is_final": bool(c.is_final),
-        }
-        for c in Clue.query.order_by(Clue.order_index.asc(), Clue.id.asc()).all()
-    ]
-    cfg = {row.key: row.value for row in Config.query.all()}
-    payload = {"clues": clues, "config": cfg}
-    return Response(json.dumps(payload, ensure_ascii=False, indent=2), mimetype="application/json")
+    export_columns = (
+        Clue.id,
+        Clue.title,
+        Clue.body_variant_a,
+        Clue.body_variant_b,
+        Clue.answer_type,
+        Clue.answer_payload,
+        Clue.hint_text,
+        Clue.order_index,
+        Clue.is_final,
+    )
+
+    def generate():
+        # Stream one clue per line so memory stays flat regardless of clue text size
+        yield '{\n  "clues": [\n'
+        rows = db.session.execute(
+            select(*export_columns)
+            .order_by(Clue.order_index.asc(), Clue.id.asc())
+            .execution_options(yield_per=100)
+        ).mappings()
+        for i, row in enumerate(rows):
+            clue = dict(row, is_final=bool(row["is_final"]))
+            yield ("    " if i == 0 else ",\n    ") + json.dumps(clue, ensure_ascii=False)
+        yield '\n  ],\n  "config": '
+        # CLUES_VERSION is an internal cache stamp, not a game setting
+        config = {k: v for k, v in get_config_map().items() if k != "CLUES_VERSION"}
+        yield json.dumps(config, ensure_ascii=False)
+        yield "\n}\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @app.post("/setup/import")
 def setup_import():
-    # Admin protection
-    admin_password_expected = app.config.get("ADMIN_PASSWORD", "")
-    provided_password = extract_basic_auth_password(request)
-    if not admin_password_expected or provided_password != admin_password_expected:
-        return unauthorized_response()
-
     file = request.files.get("file")
     if not file:
         flash("No file uploaded.", "danger")
@@ -1055,33 +1441,51 @@ def setup_import():
         flash(f"Invalid JSON: {e}", "danger")
         return redirect(url_for("setup"))
 
-    clues = data.get("clues", [])
-    config_map = data.get("config", {})
+    # Build every row before touching the database: a malformed entry (non-object
+    # clue, non-numeric order_index, ...) is reported without deleting anything
+    try:
+        clues = data.get("clues", [])
+        config_map = data.get("config", {})
 
-    # Overwrite clues
-    Clue.query.delete()
-    db.session.commit()
-    for c in clues:
-        obj = Clue(
-            id=c.get("id"),
-            title=c.get("title", ""),
-            body_variant_a=c.get("body_variant_a", ""),
-            body_variant_b=c.get("body_variant_b", ""),
-            answer_type=c.get("answer_type", "tap"),
-            answer_payload=c.get("answer_payload", ""),
-            hint_text=c.get("hint_text", ""),
-            order_index=int(c.get("order_index", 1)),
-            is_final=bool(c.get("is_final", False)),
-        )
-        db.session.add(obj)
-    db.session.commit()
+        clue_rows = [
+            {
+                "id": c.get("id"),
+                "title": c.get("title", ""),
+                "body_variant_a": c.get("body_variant_a", ""),
+                "body_variant_b": c.get("body_variant_b", ""),
+                "answer_type": c.get("answer_type", "tap"),
+                "answer_payload": c.get("answer_payload", ""),
+                "hint_text": c.get("hint_text", ""),
+                "order_index": int(c.get("order_index", 1)),
+                "is_final": bool(c.get("is_final", False)),
+            }
+            for c in clues
+        ]
+        # CLUES_VERSION (present in older exports) is managed by _bump_clues_version() below
+        config_rows = [
+            {"key": str(k), "value": str(v)} for k, v in config_map.items() if str(k) != "CLUES_VERSION"
+        ]
+    except (TypeError, ValueError, AttributeError) as e:
+        flash(f"Import failed: invalid clue or config data ({e})", "danger")
+        return redirect(url_for("setup"))
 
-    # Overwrite config
-    Config.query.delete()
-    db.session.commit()
-    for k, v in config_map.items():
-        db.session.add(Config(key=str(k), value=str(v)))
-    db.session.commit()
+    # Overwrite clues and config in one transaction, each table as a single executemany INSERT
+    try:
+        Clue.query.delete()
+        if clue_rows:
+            db.session.execute(insert(Clue), clue_rows)
+        Config.query.delete()
+        if config_rows:
+            db.session.execute(insert(Config), config_rows)
+        # Bump after the config overwrite, which deleted the previous stamp
+        _bump_clues_version()
+        db.session.commit()
+    except Exception as e:
+        # Nothing was committed; existing clues and config are untouched
+        db.session.rollback()
+        g.pop("config_map", None)
+        flash(f"Import failed: {e}", "danger")
+        return redirect(url_for("setup"))
 
     flash("Import successful.", "success")
     return redirect(url_for("setup"))
@@ -1089,22 +1493,28 @@ def setup_import():
 
 @app.get("/healthz")
 def healthz():
+    # Normally answered by _healthz_short_circuit; kept so url_for("healthz") still resolves
     return Response("ok", status=200, mimetype="text/plain")
 
 @app.get("/game_status")
 def game_status():
     """Lightweight status endpoint for clients waiting on game start."""
-    started_cfg = Config.query.get("GAME_STARTED_AT")
-    started = bool(started_cfg and (started_cfg.value or "").strip())
+    started = is_game_started()
     first = _get_first_clue()
     payload = {"started": started, "first_id": (first.id if first else None)}
     return Response(json.dumps(payload), status=200, mimetype="application/json")
 
 
+UPLOAD_MAX_AGE_SECONDS = 365 * 24 * 3600
+
+
 @app.get("/uploads/<path:filename>")
 def serve_upload(filename: str):
-    uploads_dir = os.path.join("data", "uploads")
-    return send_from_directory(uploads_dir, filename)
+    # Upload names embed a random token and are never rewritten in place,
+    # so clients may cache them indefinitely.
+    resp = send_from_directory(UPLOADS_DIR, filename, max_age=UPLOAD_MAX_AGE_SECONDS)
+    resp.cache_control.immutable = True
+    return resp
 
 
 @app.errorhandler(404)
@@ -1132,13 +1542,11 @@ def inject_elapsed_reset_nonce(resp):
                 snippets = []
 
                 # Elapsed timer reset snippet (nonce-based)
-                row = Config.query.get("CLIENT_NONCE")
-                nonce = (row.value if row and (row.value or "").strip() else "0")
+                nonce = (get_config_value("CLIENT_NONCE") or "").strip() or "0"
                 snippets.append("(function(){try{var n='%s';var k='huntNonce';var s=localStorage.getItem(k);if(s!==n){localStorage.setItem(k,n);localStorage.removeItem('huntStartAt');}}catch(e){}})();" % nonce)
 
                 # Auto-start snippet: only on index while waiting, and only if this browser has a team session
-                started_cfg = Config.query.get("GAME_STARTED_AT")
-                waiting = not (started_cfg and (started_cfg.value or "").strip())
+                waiting = not is_game_started()
                 if request.endpoint == "index" and waiting and session.get("team_id") and session.get("team_token"):
                     snippets.append("(function(){var t=setInterval(function(){fetch('/game_status',{headers:{'X-Requested-With':'fetch'}}).then(function(r){return r.ok?r.json():null;}).then(function(j){if(j&&j.started&&j.first_id){clearInterval(t);window.location.href='/clue/'+j.first_id;}}).catch(function(){});},2000);})();")
 
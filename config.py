@@ -36,6 +36,11 @@ _WTF_TRUSTED = os.getenv("WTF_CSRF_TRUSTED_ORIGINS")
 if _WTF_TRUSTED:
     WTF_CSRF_TRUSTED_ORIGINS = [h.strip() for h in _WTF_TRUSTED.split(",") if h.strip()]
 
+# Optional Redis URL (e.g. redis://redis:6379/0). When set, sessions are stored server-side
+# in Redis via Flask-Session (pip install Flask-Session redis); when unset, Flask's signed
+# cookie sessions are used.
+REDIS_URL = os.getenv("REDIS_URL", "")
+
 # Game settings exposed to templates (env overrides supported)
 GAME_SETTINGS = {
     "FIRST_CLUE_ID": int(os.getenv("FIRST_CLUE_ID", 1)),
@@ -115,6 +115,8 @@ class ClueForm(FlaskForm):
 
             if not isinstance(parsed, list) or not all(isinstance(x, str) for x in parsed):
                 raise ValidationError("MCQ options must be a JSON array of strings.")
+            # Reused by validate_answer_correct (answer_payload is validated first)
+            self._mcq_options = frozenset(parsed)
 
         # For 'text', free-form comma-separated string is fine.
         # For 'tap', payload can be empty; if provided, we accept it but it is unused.
@@ -128,13 +130,15 @@ class ClueForm(FlaskForm):
         correct = (field.data or "").strip()
         if not correct:
             raise ValidationError("Correct answer is required for MCQ.")
-        # Parse options from answer_payload
-        try:
-            options: Any = json.loads(self.answer_payload.data or "[]")
-        except json.JSONDecodeError:
-            raise ValidationError("Provide valid MCQ options first (JSON array of strings).")
-        if not isinstance(options, list) or not all(isinstance(x, str) for x in options):
-            raise ValidationError("MCQ options must be a JSON array of strings.")
+        options = getattr(self, "_mcq_options", None)
+        if options is None:
+            # Payload did not validate; parse it here to report why
+            try:
+                options = json.loads(self.answer_payload.data or "[]")
+            except json.JSONDecodeError:
+                raise ValidationError("Provide valid MCQ options first (JSON array of strings).")
+            if not isinstance(options, list) or not all(isinstance(x, str) for x in options):
+                raise ValidationError("MCQ options must be a JSON array of strings.")
         if correct not in options:
             raise ValidationError("Correct answer must match one of the options exactly.")
 
@@ -17,18 +17,21 @@ On first run, we seed 6 placeholder clues (IDs 1..6, final=True for ID 6).
 
 from __future__ import annotations
 
+import json
 import os
 from datetime import datetime
 from typing import Optional
-import uuid
+import secrets
 import random
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import UniqueConstraint, Boolean, Integer, String, Text, DateTime, ForeignKey, text
+from sqlalchemy import UniqueConstraint, Boolean, Integer, String, Text, DateTime, ForeignKey, event, insert, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # SQLAlchemy handle (init with app via `init_app_db(app)`)
-db = SQLAlchemy()
+# Sessions are request-scoped, so objects need not be expired on commit; this avoids a
+# refresh SELECT for every object touched after a request's commit.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 
 # Models
@@ -70,7 +73,7 @@ class Clue(db.Model):
     image_caption: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    is_final: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    is_final: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, index=True)
 
     progress_entries: Mapped[list["Progress"]] = relationship(
         "Progress",
@@ -79,6 +82,49 @@ class Clue(db.Model):
         passive_deletes=True,
     )
 
+    @property
+    def text_answers(self) -> tuple[bytes, ...]:
+        """
+        Accepted answers for "text" clues: the comma-separated payload, stripped and
+        casefolded, as UTF-8 bytes (ready for hmac.compare_digest).
+        Memoized on the instance; meant for the read-only cached clues served to players.
+        """
+        cached = self.__dict__.get("_text_answers")
+        if cached is None:
+            raw = self.answer_payload or ""
+            cached = tuple(s.strip().casefold().encode("utf-8") for s in raw.split(",") if s.strip())
+            self.__dict__["_text_answers"] = cached
+        return cached
+
+    @property
+    def body_variants(self) -> tuple[str, str]:
+        """
+        (variant A, variant B) body texts, stripped; index 0 for "A", 1 for "B".
+        Memoized on the instance like `text_answers`.
+        """
+        cached = self.__dict__.get("_body_variants")
+        if cached is None:
+            cached = ((self.body_variant_a or "").strip(), (self.body_variant_b or "").strip())
+            self.__dict__["_body_variants"] = cached
+        return cached
+
+    @property
+    def mcq_options(self) -> Optional[list[str]]:
+        """
+        Choices for "mcq" clues: the string entries of the JSON array in answer_payload
+        ([] if it does not parse); None for other answer types.
+        Memoized on the instance like `text_answers`.
+        """
+        if "_mcq_options" not in self.__dict__:
+            options = None
+            if (self.answer_type or "").lower() == "mcq":
+                try:
+                    options = [str(o) for o in json.loads(self.answer_payload or "[]") if isinstance(o, str)]
+                except Exception:
+                    options = []
+            self.__dict__["_mcq_options"] = options
+        return self.__dict__["_mcq_options"]
+
     def __repr__(self) -> str:  # pragma: no cover - debug utility
         return f"<Clue id={self.id} title={self.title!r} order={self.order_index} final={self.is_final}>"
 
@@ -133,20 +179,72 @@ def _sqlite_db_path_from_uri(uri: str) -> Optional[str]:
     return uri[len(prefix):]
 
 
+def _set_sqlite_pragmas(dbapi_conn, _conn_record) -> None:
+    """
+    Per-connection SQLite tuning. WAL lets readers (leaderboard/admin) proceed while a
+    writer commits; synchronous=NORMAL skips the fsync of the main DB on each commit
+    (still crash-safe in WAL mode). Temp tables in memory, a ~20 MB page cache and
+    mmap'd reads help the aggregate queries.
+    """
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-20000")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
+
+_SLUG_ADJECTIVES = (
+    "amber", "aqua", "azure", "coral", "ivory", "jade", "lilac", "mint",
+    "peach", "plum", "rose", "sage", "sunny", "violet", "silver", "golden",
+)
+_SLUG_NOUNS = (
+    "banana", "caterpillar", "comet", "river", "meadow", "maple", "pebble", "harbor",
+    "lantern", "puzzle", "galaxy", "marble", "sunrise", "breeze", "willow", "orchid",
+)
+
+
 def generate_readable_slug(existing: set[str]) -> str:
-    adjectives = [
-        "amber", "aqua", "azure", "coral", "ivory", "jade", "lilac", "mint",
-        "peach", "plum", "rose", "sage", "sunny", "violet", "silver", "golden"
-    ]
-    nouns = [
-        "banana", "caterpillar", "comet", "river", "meadow", "maple", "pebble", "harbor",
-        "lantern", "puzzle", "galaxy", "marble", "sunrise", "breeze", "willow", "orchid"
-    ]
+    # ~16.7M combinations, so a retry is rare even with thousands of clues
     while True:
-        slug = f"{random.choice(adjectives)}-{random.choice(nouns)}-{uuid.uuid4().hex[:4]}"
+        slug = f"{random.choice(_SLUG_ADJECTIVES)}-{random.choice(_SLUG_NOUNS)}-{secrets.token_hex(2)}"
         if slug not in existing:
             return slug
 
+# Bump when _migrate_schema() gains a step; stored in SQLite's PRAGMA user_version
+SCHEMA_VERSION = 1
+
+
+def _migrate_schema() -> None:
+    """Add columns and indexes that create_all() does not add to existing tables."""
+    cols = {row[1] for row in db.session.execute(text("PRAGMA table_info('clues')")).fetchall()}
+    pcols = {row[1] for row in db.session.execute(text("PRAGMA table_info('progress')")).fetchall()}
+    ddl = []
+    if 'image_filename' not in cols:
+        ddl.append("ALTER TABLE clues ADD COLUMN image_filename VARCHAR(255)")
+    if 'image_alt' not in cols:
+        ddl.append("ALTER TABLE clues ADD COLUMN image_alt VARCHAR(255)")
+    if 'image_caption' not in cols:
+        ddl.append("ALTER TABLE clues ADD COLUMN image_caption TEXT")
+    if 'slug' not in cols:
+        ddl.append("ALTER TABLE clues ADD COLUMN slug VARCHAR(64)")
+    if 'answer_correct' not in cols:
+        ddl.append("ALTER TABLE clues ADD COLUMN answer_correct VARCHAR(255)")
+    if 'wrong_attempts' not in pcols:
+        ddl.append("ALTER TABLE progress ADD COLUMN wrong_attempts INTEGER DEFAULT 0")
+    # Enforce uniqueness at DB level where possible
+    ddl.append("CREATE UNIQUE INDEX IF NOT EXISTS uq_clues_slug ON clues(slug)")
+    # Indexes backing clue ordering / final-clue lookups (create_all skips existing tables)
+    ddl.append("CREATE INDEX IF NOT EXISTS ix_clues_order_index ON clues(order_index)")
+    ddl.append("CREATE INDEX IF NOT EXISTS ix_clues_is_final ON clues(is_final)")
+    for stmt in ddl:
+        # Raw driver SQL: one-shot DDL gains nothing from SQLAlchemy's statement compilation
+        db.session.connection().exec_driver_sql(stmt)
+    db.session.connection().exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.session.commit()
+
+
 def init_app_db(app) -> None:
     """
     Bind SQLAlchemy to the Flask app, ensure the data directory exists,
@@ -162,6 +260,10 @@ def init_app_db(app) -> None:
         os.makedirs(data_dir, exist_ok=True)
 
     with app.app_context():
+        # Tune every new SQLite connection (registered before the first connect below)
+        if db_path:
+            event.listen(db.engine, "connect", _set_sqlite_pragmas)
+
         # Create tables if DB file doesn't exist yet
         create_needed = bool(db_path) and not os.path.exists(db_path)
         if create_needed:
@@ -170,47 +272,25 @@ def init_app_db(app) -> None:
             # Even if file exists, ensure tables are present (idempotent)
             db.create_all()
 
-        # Lightweight migration: ensure clue image/slug columns exist (SQLite)
+        # Lightweight migration (SQLite). The DDL part is skipped once the database file
+        # records SCHEMA_VERSION in its header, so a normal boot costs a single PRAGMA read.
         try:
-            cols = {row[1] for row in db.session.execute(text("PRAGMA table_info('clues')")).fetchall()}
-            if 'image_filename' not in cols:
-                db.session.execute(text("ALTER TABLE clues ADD COLUMN image_filename VARCHAR(255)"))
-            if 'image_alt' not in cols:
-                db.session.execute(text("ALTER TABLE clues ADD COLUMN image_alt VARCHAR(255)"))
-            if 'image_caption' not in cols:
-                db.session.execute(text("ALTER TABLE clues ADD COLUMN image_caption TEXT"))
-            if 'slug' not in cols:
-                db.session.execute(text("ALTER TABLE clues ADD COLUMN slug VARCHAR(64)"))
-            if 'answer_correct' not in cols:
-                db.session.execute(text("ALTER TABLE clues ADD COLUMN answer_correct VARCHAR(255)"))
-            # Enforce uniqueness at DB level where possible
-            db.session.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_clues_slug ON clues(slug)"))
-            db.session.commit()
-
-            # Backfill missing slugs
-            existing = {
-                s for (s,) in db.session.execute(text("SELECT slug FROM clues WHERE slug IS NOT NULL AND slug != ''")).fetchall()
-            }
-            missing = db.session.execute(
-                text("SELECT id FROM clues WHERE slug IS NULL OR slug = ''")
-            ).fetchall()
-            for (clue_id,) in missing:
-                slug = generate_readable_slug(existing)
-                db.session.execute(
-                    text("UPDATE clues SET slug = :slug WHERE id = :id"),
-                    {"slug": slug, "id": clue_id},
-                )
-                existing.add(slug)
-            db.session.commit()
-
-            # Ensure progress table has wrong_attempts column (SQLite lightweight migration)
-            try:
-                pcols = {row[1] for row in db.session.execute(text("PRAGMA table_info('progress')")).fetchall()}
-                if 'wrong_attempts' not in pcols:
-                    db.session.execute(text("ALTER TABLE progress ADD COLUMN wrong_attempts INTEGER DEFAULT 0"))
+            if (db.session.execute(text("PRAGMA user_version")).scalar() or 0) < SCHEMA_VERSION:
+                _migrate_schema()
+
+            # Backfill missing slugs (clues imported without one get theirs on next boot)
+            rows = db.session.execute(text("SELECT id, slug FROM clues")).fetchall()
+            existing = {slug for (_id, slug) in rows if slug}
+            updates = []
+            for clue_id, slug in rows:
+                if not slug:
+                    slug = generate_readable_slug(existing)
+                    existing.add(slug)
+                    updates.append({"slug": slug, "id": clue_id})
+            if updates:
+                # One executemany UPDATE for all missing rows
+                db.session.execute(text("UPDATE clues SET slug = :slug WHERE id = :id"), updates)
                 db.session.commit()
-            except Exception:
-                db.session.rollback()
         except Exception:
             db.session.rollback()
 
@@ -227,26 +307,27 @@ def seed_default_clues() -> None:
     if Clue.query.count() > 0:
         return
 
-    to_add: list[Clue] = []
+    rows: list[dict] = []
     existing_slugs: set[str] = set()
     for i in range(1, 7):
         slug = generate_readable_slug(existing_slugs)
         existing_slugs.add(slug)
-        to_add.append(
-            Clue(
-                id=i,  # set explicit ids so routes /clue/<id> map cleanly to 1..6
-                title=f"Clue {i}",
-                body_variant_a=f"This is Clue {i} (A)",
-                body_variant_b=f"This is Clue {i} (B)",
-                answer_type="tap",
-                answer_payload="",
-                hint_text=f"Hint for Clue {i}",
-                slug=slug,
-                order_index=i,
-                is_final=(i == 6),
-            )
+        rows.append(
+            {
+                "id": i,  # set explicit ids so routes /clue/<id> map cleanly to 1..6
+                "title": f"Clue {i}",
+                "body_variant_a": f"This is Clue {i} (A)",
+                "body_variant_b": f"This is Clue {i} (B)",
+                "answer_type": "tap",
+                "answer_payload": "",
+                "hint_text": f"Hint for Clue {i}",
+                "slug": slug,
+                "order_index": i,
+                "is_final": (i == 6),
+            }
         )
-    db.session.bulk_save_objects(to_add)
+    # Single executemany INSERT; no ORM objects needed for seeding
+    db.session.execute(insert(Clue), rows)
     db.session.commit()
 
 
@@ -0,0 +1,55 @@
+"""
+The SQL leaderboard must score and time teams exactly like _compute_score(),
+which /admin and the CSV export use.
+
+Run with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# config.py reads DATA_DIR at import: point it at a throwaway directory first
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from models import Config, Progress, Team, db  # noqa: E402
+
+
+class LeaderboardElapsedTimeTest(unittest.TestCase):
+    def setUp(self):
+        ctx = app_module.app.test_request_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+        Progress.query.delete()
+        Team.query.delete()
+        Config.query.filter_by(key="GAME_STARTED_AT").delete()
+        db.session.commit()
+
+    def test_fractional_second_is_not_rounded_up(self):
+        # 119.9996 s after the start: still inside the first 2-minute window
+        started = datetime(2026, 1, 1, 10, 0, 0)
+        completed = started + timedelta(seconds=119, microseconds=999600)
+        db.session.add(Config(key="GAME_STARTED_AT", value=started.isoformat()))
+        team = Team(name="Edge", token="edge-token", created_at=started, completed_at=completed)
+        db.session.add(team)
+        db.session.commit()
+
+        game_started_at = app_module._get_game_started_at()
+        (name, score, _solved, _completed_at, elapsed_us), = app_module.fetch_leaderboard_rows(game_started_at)
+        expected_score, _, _, _, expected_elapsed = app_module._compute_score(
+            team, app_module.fetch_all_scores().get(team.id), game_started_at
+        )
+
+        self.assertEqual(name, "Edge")
+        self.assertEqual(elapsed_us, 119999600)
+        self.assertEqual(timedelta(microseconds=elapsed_us), expected_elapsed)
+        self.assertEqual(score, expected_score)
+        self.assertEqual(score, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()